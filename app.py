@@ -1,10 +1,12 @@
+import hashlib
+import io
 import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from power_optimizer import optimize_power
-from data_processor import process_data, calculate_metrics
+from power_optimizer import optimize_power_arrays
+from data_processor import process_csv_in_chunks, calculate_metrics_arrays
 
 # Page configuration
 st.set_page_config(
@@ -20,6 +22,66 @@ This application analyzes wind turbine data and provides recommendations
 for optimizing power generation based on environmental conditions.
 """)
 
+
+@st.cache_data
+def load_preview(data_hash, _file_bytes, rows=5):
+    """Parse only the first rows of the uploaded CSV for display, memoized on data_hash."""
+    return pd.read_csv(io.BytesIO(_file_bytes), nrows=rows)
+
+
+@st.cache_data(show_spinner=False)
+def load_arrays(data_hash, _file_bytes):
+    """
+    Stream the uploaded CSV through process_data, memoized on data_hash.
+
+    Only the processed column arrays are kept, never the full raw frame.
+    """
+    return process_csv_in_chunks(io.BytesIO(_file_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def cached_optimize_power(data_hash, wind_speed_threshold, yaw_angle_range, pitch_angle_range, _arrays):
+    """
+    Memoized wrapper around optimize_power_arrays.
+
+    The cache is keyed on data_hash, a fingerprint of the uploaded file, instead of
+    hashing the processed arrays on every call (Streamlit skips underscore arguments).
+    """
+    return optimize_power_arrays(
+        _arrays,
+        wind_speed_threshold=wind_speed_threshold,
+        yaw_angle_range=yaw_angle_range,
+        pitch_angle_range=pitch_angle_range
+    )
+
+
+@st.cache_resource
+def power_scatter_figure(data_hash, _arrays, max_points=20_000):
+    """Wind speed vs power output scatter plot on a random subset, rendered once per dataset."""
+    wind_speed, power_output = _arrays['wind_speed'], _arrays['power_output']
+    if len(wind_speed) > max_points:
+        sample = np.random.default_rng(0).choice(len(wind_speed), max_points, replace=False)
+        wind_speed, power_output = wind_speed[sample], power_output[sample]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(x=wind_speed, y=power_output, alpha=0.6, ax=ax)
+    ax.set_xlabel('Wind Speed (m/s)')
+    ax.set_ylabel('Power Output (kW)')
+    return fig
+
+
+@st.cache_resource
+def power_histogram_figure(data_hash, _arrays, bins=80):
+    """Power output distribution plot from a precomputed histogram, rendered once per dataset."""
+    counts, edges = np.histogram(_arrays['power_output'], bins=bins)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+    ax.set_xlabel('Power Output (kW)')
+    ax.set_ylabel('Frequency')
+    return fig
+
+
 # Sidebar for data upload and parameters
 st.sidebar.header("Data Input")
 uploaded_file = st.sidebar.file_uploader("Upload wind turbine data (CSV)", type=["csv"])
@@ -33,73 +95,72 @@ pitch_angle_range = st.sidebar.slider("Pitch Angle Range (±degrees)", 0, 20, 10
 # Main content area
 if uploaded_file is not None:
     # Load data
-    data = pd.read_csv(uploaded_file)
+    file_bytes = uploaded_file.getvalue()
+
+    # Fingerprint each upload once rather than on every rerun
+    if st.session_state.get('data_file_id') != uploaded_file.file_id:
+        st.session_state['data_file_id'] = uploaded_file.file_id
+        st.session_state['data_hash'] = hashlib.blake2b(file_bytes, digest_size=16).digest()
+    data_hash = st.session_state['data_hash']
     st.subheader("Data Preview")
-    st.dataframe(data.head())
+    st.dataframe(load_preview(data_hash, file_bytes))
 
     # Process data
-    processed_data = process_data(data)
-
-    # Data visualization
-    st.subheader("Data Visualization")
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.write("Wind Speed vs Power Output")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(x='wind_speed', y='power_output', data=processed_data, alpha=0.6)
-        plt.xlabel('Wind Speed (m/s)')
-        plt.ylabel('Power Output (kW)')
-        st.pyplot(fig)
-
-    with col2:
-        st.write("Power Output Distribution")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.histplot(processed_data['power_output'], kde=True)
-        plt.xlabel('Power Output (kW)')
-        plt.ylabel('Frequency')
-        st.pyplot(fig)
-
-    # Optimization
-    st.subheader("Power Optimization")
-
-    if st.button("Run Optimization"):
-        with st.spinner("Optimizing power generation..."):
-            optimized_params, expected_gain = optimize_power(
-                processed_data,
-                wind_speed_threshold=wind_speed_threshold,
-                yaw_angle_range=yaw_angle_range,
-                pitch_angle_range=pitch_angle_range
-            )
-
-            # Display optimization results
-            st.success(f"Optimization complete! Expected power gain: {expected_gain:.2f}%")
-
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Optimal Yaw Angle", f"{optimized_params['yaw_angle']:.2f}°")
-            col2.metric("Optimal Pitch Angle", f"{optimized_params['pitch_angle']:.2f}°")
-            col3.metric("Estimated Power Increase", f"{expected_gain:.2f}%")
-
-            # Visualize before/after
-            st.subheader("Before vs After Optimization")
-
-            # Calculate metrics
-            current_metrics, optimized_metrics = calculate_metrics(processed_data, optimized_params)
-
-            comparison_data = pd.DataFrame({
-                'Metric': ['Average Power (kW)', 'Efficiency (%)', 'Annual Energy Production (MWh)'],
-                'Current': [current_metrics['avg_power'], current_metrics['efficiency'],
-                            current_metrics['annual_energy']],
-                'Optimized': [optimized_metrics['avg_power'], optimized_metrics['efficiency'],
-                              optimized_metrics['annual_energy']],
-                'Improvement (%)': [
-                    (optimized_metrics['avg_power'] / current_metrics['avg_power'] - 1) * 100,
-                    (optimized_metrics['efficiency'] / current_metrics['efficiency'] - 1) * 100,
-                    (optimized_metrics['annual_energy'] / current_metrics['annual_energy'] - 1) * 100
-                ]
-            })
-
-            st.table(comparison_data.set_index('Metric'))
+    with st.spinner("Processing data..."):
+        arrays = load_arrays(data_hash, file_bytes)
+
+    if len(arrays.get('wind_speed', [])) == 0:
+        st.warning("No valid rows remain after processing. Check that the CSV has data rows in the expected format.")
+    else:
+        # Data visualization
+        st.subheader("Data Visualization")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("Wind Speed vs Power Output")
+            st.pyplot(power_scatter_figure(data_hash, arrays))
+
+        with col2:
+            st.write("Power Output Distribution")
+            st.pyplot(power_histogram_figure(data_hash, arrays))
+
+        # Optimization
+        st.subheader("Power Optimization")
+
+        if st.button("Run Optimization"):
+            with st.spinner("Optimizing power generation..."):
+                optimized_params, expected_gain = cached_optimize_power(
+                    data_hash, wind_speed_threshold, yaw_angle_range, pitch_angle_range, arrays
+                )
+
+                # Display optimization results
+                st.success(f"Optimization complete! Expected power gain: {expected_gain:.2f}%")
+
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Optimal Yaw Angle", f"{optimized_params['yaw_angle']:.2f}°")
+                col2.metric("Optimal Pitch Angle", f"{optimized_params['pitch_angle']:.2f}°")
+                col3.metric("Estimated Power Increase", f"{expected_gain:.2f}%")
+
+                # Visualize before/after
+                st.subheader("Before vs After Optimization")
+
+                # Calculate metrics
+                current_metrics, optimized_metrics = calculate_metrics_arrays(arrays, optimized_params)
+
+                comparison_data = pd.DataFrame({
+                    'Metric': ['Average Power (kW)', 'Efficiency (%)', 'Annual Energy Production (MWh)'],
+                    'Current': [current_metrics['avg_power'], current_metrics['efficiency'],
+                                current_metrics['annual_energy']],
+                    'Optimized': [optimized_metrics['avg_power'], optimized_metrics['efficiency'],
+                                  optimized_metrics['annual_energy']],
+                    'Improvement (%)': [
+                        (optimized_metrics['avg_power'] / current_metrics['avg_power'] - 1) * 100,
+                        (optimized_metrics['efficiency'] / current_metrics['efficiency'] - 1) * 100,
+                        (optimized_metrics['annual_energy'] / current_metrics['annual_energy'] - 1) * 100
+                    ]
+                })
+
+                st.table(comparison_data.set_index('Metric'))
 else:
     st.info("Upload a CSV file to begin analysis and optimization")
 
@@ -1,5 +1,17 @@
 import pandas as pd
 import numpy as np
+import numexpr as ne
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+# Physical sensor measurements; single precision is plenty and halves memory traffic
+SENSOR_COLUMNS = [
+    'wind_speed', 'wind_direction', 'temperature', 'air_density',
+    'power_output', 'yaw_angle', 'pitch_angle'
+]
+
+# Standard turbine swept area in m², can be adjusted based on actual turbine size
+TURBINE_AREA = np.float32(10000.)
 
 
 def process_data(data):
@@ -14,39 +26,121 @@ def process_data(data):
     """
     processed_data = data.copy()
 
+    # Store sensor columns in single precision
+    for column in SENSOR_COLUMNS:
+        if column in processed_data.columns:
+            processed_data[column] = processed_data[column].astype('float32')
+
     # Convert timestamp to datetime if it's not already
     if 'timestamp' in processed_data.columns and not pd.api.types.is_datetime64_any_dtype(processed_data['timestamp']):
         processed_data['timestamp'] = pd.to_datetime(processed_data['timestamp'])
 
-    # Handle missing values
-    processed_data = processed_data.interpolate(method='linear')
-
-    # Filter out unrealistic values
-    processed_data = processed_data[processed_data['wind_speed'] >= 0]
-    processed_data = processed_data[processed_data['wind_speed'] <= 50]  # Max realistic wind speed
+    # Handle missing values (numeric columns only). Sparse gaps, typical for SCADA data,
+    # are filled forward then backward; denser gaps are interpolated linearly. When streamed
+    # through process_csv_in_chunks this is decided, and applied, per batch.
+    numeric_columns = processed_data.select_dtypes('number').columns
+    missing = processed_data[numeric_columns].isna().to_numpy()
+    if missing.any():
+        if missing.mean() < 0.01:
+            processed_data[numeric_columns] = processed_data[numeric_columns].ffill().bfill()
+        else:
+            processed_data[numeric_columns] = processed_data[numeric_columns].interpolate(
+                method='linear', limit_direction='both'
+            )
+
+    # Filter out unrealistic values with a single combined mask
+    wind_speed = processed_data['wind_speed'].to_numpy()
+    mask = (wind_speed >= 0) & (wind_speed <= 50)  # Max realistic wind speed
 
     if 'power_output' in processed_data.columns:
-        processed_data = processed_data[processed_data['power_output'] >= 0]
+        mask &= processed_data['power_output'].to_numpy() >= 0
+
+    processed_data = processed_data.loc[mask]
 
     # Add derived features
     if 'wind_speed' in processed_data.columns and 'air_density' in processed_data.columns:
+        wind_speed = processed_data['wind_speed'].to_numpy()
+        air_density = processed_data['air_density'].to_numpy()
+
         # Theoretical power in the wind (P = 0.5 * ρ * A * v³)
         # Assuming a standard turbine area
-        turbine_area = 10000  # m², can be adjusted based on actual turbine size
-        processed_data['theoretical_power'] = 0.5 * processed_data['air_density'] * turbine_area * processed_data[
-            'wind_speed'] ** 3
+        theoretical_power = ne.evaluate(
+            'rho * A * v ** 3 / 2',  # Integer divisor keeps the expression in float32
+            local_dict={'rho': air_density, 'A': TURBINE_AREA, 'v': wind_speed}
+        )
+        processed_data['theoretical_power'] = theoretical_power
 
         # Calculate efficiency if power_output is available
         if 'power_output' in processed_data.columns:
-            processed_data['efficiency'] = (processed_data['power_output'] * 1000) / processed_data[
-                'theoretical_power']  # Convert kW to W
+            efficiency = ne.evaluate(
+                'where(theo > 0, power * 1000 / theo, 0)',  # Convert kW to W
+                local_dict={'power': processed_data['power_output'].to_numpy(), 'theo': theoretical_power}
+            )
 
             # Cap efficiency at realistic values
-            processed_data['efficiency'] = processed_data['efficiency'].clip(0, 0.59)  # Betz limit is 0.59
+            np.clip(efficiency, 0, np.float32(0.59), out=efficiency)  # Betz limit is 0.59
+            processed_data['efficiency'] = efficiency
 
     return processed_data
 
 
+def process_csv_in_chunks(source, block_size=32 << 20):
+    """
+    Stream a CSV through process_data batch by batch without loading the whole frame.
+
+    Args:
+        source: Path or file-like object with CSV wind turbine data
+        block_size: Approximate number of bytes parsed per batch
+
+    Returns:
+        Dictionary mapping column names to NumPy arrays of the processed data
+    """
+    # Only parse the columns process_data uses. Types of any other column would be guessed from
+    # the first block alone, and a later block that does not fit the guess fails to convert.
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    columns = [column for column in ['timestamp'] + SENSOR_COLUMNS if column in header]
+
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: pa.float32() for column in SENSOR_COLUMNS if column in header}
+        )
+    )
+
+    # Only the filtered column arrays of each batch are kept; concatenate once at the end
+    chunks = {}
+    for batch in reader:
+        for column, values in extract_arrays(process_data(batch.to_pandas())).items():
+            chunks.setdefault(column, []).append(values)
+
+    # A header-only file still yields the (empty) processed columns
+    if not chunks:
+        return extract_arrays(process_data(reader.schema.empty_table().to_pandas()))
+
+    return {column: np.concatenate(values) for column, values in chunks.items()}
+
+
+def extract_arrays(data):
+    """
+    Extract NumPy arrays for the columns used by the optimizer and metrics.
+
+    Args:
+        data: Processed DataFrame with wind turbine data
+
+    Returns:
+        Dictionary mapping column names to NumPy arrays
+    """
+    columns = [
+        'wind_speed', 'wind_direction', 'air_density', 'power_output', 'yaw_angle', 'pitch_angle',
+        'theoretical_power', 'efficiency'
+    ]
+    return {column: data[column].to_numpy() for column in columns if column in data.columns}
+
+
 def calculate_metrics(data, optimized_params):
     """
     Calculate performance metrics for current and optimized settings.
@@ -55,23 +149,39 @@ def calculate_metrics(data, optimized_params):
         data: Processed DataFrame with wind turbine data
         optimized_params: Dictionary with optimized parameters
 
+    Returns:
+        Two dictionaries with current and optimized metrics
+    """
+    return calculate_metrics_arrays(extract_arrays(data), optimized_params)
+
+
+def calculate_metrics_arrays(arrays, optimized_params):
+    """
+    Calculate performance metrics for current and optimized settings on pre-extracted arrays.
+
+    Args:
+        arrays: Dictionary mapping column names to NumPy arrays
+        optimized_params: Dictionary with optimized parameters
+
     Returns:
         Two dictionaries with current and optimized metrics
     """
     # Current metrics
+    avg_power = arrays['power_output'].mean()
     current_metrics = {
-        'avg_power': data['power_output'].mean(),
-        'efficiency': data['efficiency'].mean() * 100 if 'efficiency' in data.columns else 35,
-        'annual_energy': data['power_output'].mean() * 8760 / 1000  # MWh (assuming 8760 hours in a year)
+        'avg_power': avg_power,
+        'efficiency': arrays['efficiency'].mean() * 100 if 'efficiency' in arrays else 35,
+        'annual_energy': avg_power * 8760 / 1000  # MWh (assuming 8760 hours in a year)
     }
 
-    # Create a copy for optimized metrics
-    optimized_data = data.copy()
-
     # Apply simple improvement model based on optimized parameters
     # This is a simplified model and should be replaced with a more accurate one
-    yaw_improvement = 1 + 0.003 * np.mean(np.abs(data['wind_direction'] - optimized_params['yaw_angle']))
-    pitch_improvement = 1 + 0.002 * np.mean(np.abs(data['pitch_angle'] - optimized_params['pitch_angle']))
+    yaw_misalignment = np.mod(arrays['wind_direction'] - optimized_params['yaw_angle'], 360)
+    np.minimum(yaw_misalignment, 360 - yaw_misalignment, out=yaw_misalignment)  # Circular nature of angles
+    pitch_adjustment = np.abs(arrays['pitch_angle'] - optimized_params['pitch_angle'])
+
+    yaw_improvement = 1 + 0.003 * yaw_misalignment.mean()
+    pitch_improvement = 1 + 0.002 * pitch_adjustment.mean()
     total_improvement = yaw_improvement * pitch_improvement
 
     # Calculate optimized metrics
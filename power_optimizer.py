@@ -1,44 +1,118 @@
 import pandas as pd
 import numpy as np
-from scipy.optimize import minimize
+from numba import njit, prange, types
+from scipy.optimize import minimize_scalar
+from data_processor import TURBINE_AREA, extract_arrays
 
 
-def power_model(params, data, wind_speed_threshold):
+# Eagerly compiled for C-contiguous single (the optimizer's arrays) and double precision samples.
+# Read-only array types also accept writable arrays, e.g. copy-on-write Series.to_numpy() views.
+_KERNEL_SIGNATURES = [
+    types.float64(types.float64, types.float64, *[types.Array(dtype, 1, 'C', readonly=True)] * 3)
+    for dtype in (types.float32, types.float64)
+]
+
+
+@njit(_KERNEL_SIGNATURES, parallel=True, fastmath=True, boundscheck=False, cache=True)
+def _power_kernel(yaw, pitch, ws3_rho, wind_direction, pitch_angle):
+    """
+    Fused loop over the relevant samples computing the mean power.
+
+    Returns:
+        Mean power
+    """
+    n = ws3_rho.shape[0]
+    power = 0.0
+    for i in prange(n):
+        # Adjust for circular nature of angles (branchless); yaw may lie outside [0, 360)
+        yaw_diff = (wind_direction[i] - yaw) % 360
+        yaw_misalignment = min(yaw_diff, 360 - yaw_diff)
+
+        yaw_factor = 1 - 0.01 * yaw_misalignment
+        pitch_factor = 1 - 0.02 * abs(pitch_angle[i] - pitch)
+
+        power += ws3_rho[i] * yaw_factor * pitch_factor
+    return power / n
+
+
+def power_model(params, ws3_rho, wind_direction, pitch_angle):
     """
     Model to predict power output based on parameters.
 
     Args:
         params: List of [yaw_angle, pitch_angle]
-        data: DataFrame with wind turbine data
-        wind_speed_threshold: Wind speed threshold for optimization
+        ws3_rho: Array of 0.25 * air_density * wind_speed³ for the relevant samples
+        wind_direction: Array of wind directions for the relevant samples
+        pitch_angle: Array of current pitch angles for the relevant samples
 
     Returns:
         Negative power output (for minimization)
     """
-    yaw_angle, pitch_angle = params
-
-    # Filter data for relevant wind speeds
-    relevant_data = data[data['wind_speed'] >= wind_speed_threshold].copy()
+    yaw, pitch = params
 
-    if len(relevant_data) == 0:
+    if len(ws3_rho) == 0:
         return 0
 
-    # Calculate yaw misalignment
-    relevant_data['yaw_misalignment'] = np.abs(relevant_data['wind_direction'] - yaw_angle)
-    # Adjust for circular nature of angles
-    relevant_data.loc[relevant_data['yaw_misalignment'] > 180, 'yaw_misalignment'] = 360 - relevant_data.loc[
-        relevant_data['yaw_misalignment'] > 180, 'yaw_misalignment']
-
-    # Calculate pitch adjustment
-    relevant_data['pitch_adjustment'] = np.abs(pitch_angle - relevant_data['pitch_angle'])
+    # Bring the samples to one of the kernel's compiled layouts; a no-op for the optimizer's own
+    # contiguous float32 arrays, a conversion for strided, integer or mixed-precision input
+    dtype = np.float32 if all(np.asarray(values).dtype == np.float32
+                              for values in (ws3_rho, wind_direction, pitch_angle)) else np.float64
+    ws3_rho, wind_direction, pitch_angle = (
+        np.ascontiguousarray(values, dtype=dtype) for values in (ws3_rho, wind_direction, pitch_angle)
+    )
 
     # Simplified power model based on wind speed, yaw misalignment, and pitch
     # This is a simplified model and should be replaced with a more accurate one based on turbine specifications
-    power = relevant_data['wind_speed'] ** 3 * 0.5 * relevant_data['air_density'] * 0.5 * \
-            (1 - 0.01 * relevant_data['yaw_misalignment']) * \
-            (1 - 0.02 * relevant_data['pitch_adjustment'])
+    return -_power_kernel(float(yaw), float(pitch), ws3_rho, wind_direction, pitch_angle)  # Negative for minimization
+
+
+def power_surface(yaw_angles, pitch_angles, ws3_rho, wind_direction, pitch_angle, chunk_size=16_384):
+    """
+    Evaluate the mean power model over a grid of yaw and pitch angles.
+
+    The model is a product of a yaw-only and a pitch-only factor per sample, so the
+    surface is a matrix product over the sample axis, accumulated chunk by chunk.
+
+    Args:
+        yaw_angles: Array of candidate yaw angles
+        pitch_angles: Array of candidate pitch angles
+        ws3_rho: Array of 0.25 * air_density * wind_speed³ for the relevant samples
+        wind_direction: Array of wind directions for the relevant samples
+        pitch_angle: Array of current pitch angles for the relevant samples
+        chunk_size: Number of samples evaluated at a time, bounding peak memory
+
+    Returns:
+        Array of mean power with shape (len(yaw_angles), len(pitch_angles))
+    """
+    n = len(ws3_rho)
+    surface = np.zeros((len(yaw_angles), len(pitch_angles)))
+
+    if n == 0:
+        return surface
+
+    # Keep all (grid, chunk) temporaries in single precision
+    yaw_angles = np.asarray(yaw_angles, dtype=np.float32)[:, None]
+    pitch_angles = np.asarray(pitch_angles, dtype=np.float32)[:, None]
+    ws3_rho = np.asarray(ws3_rho, dtype=np.float32)
+    wind_direction = np.asarray(wind_direction, dtype=np.float32)
+    pitch_angle = np.asarray(pitch_angle, dtype=np.float32)
+
+    for start in range(0, n, chunk_size):
+        stop = start + chunk_size
 
-    return -np.mean(power)  # Negative for minimization
+        yaw_factor = np.mod(wind_direction[None, start:stop] - yaw_angles, np.float32(360))
+        np.minimum(yaw_factor, 360 - yaw_factor, out=yaw_factor)
+        yaw_factor *= -0.01
+        yaw_factor += 1
+        yaw_factor *= ws3_rho[start:stop]
+
+        pitch_factor = np.abs(pitch_angle[None, start:stop] - pitch_angles)
+        pitch_factor *= -0.02
+        pitch_factor += 1
+
+        surface += yaw_factor @ pitch_factor.T
+
+    return surface / n
 
 
 def optimize_power(data, wind_speed_threshold=12.0, yaw_angle_range=15, pitch_angle_range=10):
@@ -54,36 +128,112 @@ def optimize_power(data, wind_speed_threshold=12.0, yaw_angle_range=15, pitch_an
     Returns:
         Dictionary of optimized parameters and expected gain
     """
-    # Calculate average wind direction
-    avg_wind_direction = data['wind_direction'].mean()
+    return optimize_power_arrays(extract_arrays(data), wind_speed_threshold, yaw_angle_range, pitch_angle_range)
+
+
+def optimize_power_arrays(arrays, wind_speed_threshold=12.0, yaw_angle_range=15, pitch_angle_range=10):
+    """
+    Optimize turbine parameters for maximum power output on pre-extracted arrays.
+
+    Args:
+        arrays: Dictionary mapping column names to NumPy arrays
+        wind_speed_threshold: Wind speed threshold for optimization
+        yaw_angle_range: Range for yaw angle optimization (± degrees)
+        pitch_angle_range: Range for pitch angle optimization (± degrees)
+
+    Returns:
+        Dictionary of optimized parameters and expected gain
+    """
+    # Calculate power-weighted (P ∝ v³) circular mean wind direction
+    weights = arrays['wind_speed'].astype(np.float64) ** 3
+    direction = np.radians(arrays['wind_direction'])
+    avg_wind_direction = np.degrees(np.arctan2((weights * np.sin(direction)).sum(),
+                                               (weights * np.cos(direction)).sum())) % 360
 
     # Calculate average pitch angle
-    avg_pitch_angle = data['pitch_angle'].mean()
+    avg_pitch_angle = arrays['pitch_angle'].mean()
 
     # Initial parameters
     initial_params = [avg_wind_direction, avg_pitch_angle]
 
-    # Parameter bounds
+    # Parameter bounds (the yaw interval may extend past 0°/360°; angle differences are taken modulo 360)
     bounds = [
         (avg_wind_direction - yaw_angle_range, avg_wind_direction + yaw_angle_range),
         (max(0, avg_pitch_angle - pitch_angle_range), avg_pitch_angle + pitch_angle_range)
     ]
 
-    # Optimization
-    result = minimize(
-        power_model,
-        initial_params,
-        args=(data, wind_speed_threshold),
-        bounds=bounds,
-        method='L-BFGS-B'
+    # Filter data for relevant wind speeds once; the optimizer only sees plain arrays
+    wind_speed = arrays['wind_speed']
+    mask = wind_speed >= wind_speed_threshold
+    wind_direction = arrays['wind_direction'][mask]
+    pitch_angle = arrays['pitch_angle'][mask]
+
+    # Loop-invariant part of the power model (0.5 * ρ * v³ * 0.5), reusing the
+    # theoretical power (0.5 * ρ * A * v³) from process_data when available
+    if 'theoretical_power' in arrays:
+        ws3_rho = arrays['theoretical_power'][mask] / (2 * TURBINE_AREA)
+    else:
+        ws3_rho = 0.25 * arrays['air_density'][mask] * wind_speed[mask] ** 3
+
+    # Match the kernel's compiled float32 contiguous signature so no dispatch or conversion happens per call
+    ws3_rho, wind_direction, pitch_angle = (
+        np.ascontiguousarray(values, dtype=np.float32) for values in (ws3_rho, wind_direction, pitch_angle)
     )
 
+    # Nothing to optimize without samples above the threshold
+    if len(ws3_rho) == 0:
+        return {
+            'yaw_angle': avg_wind_direction,
+            'pitch_angle': avg_pitch_angle
+        }, 0
+
+    # Global search over the bounded parameter grid
+    yaw_angles = np.linspace(*bounds[0], 61)
+    pitch_angles = np.linspace(*bounds[1], 41)
+    surface = power_surface(yaw_angles, pitch_angles, ws3_rho, wind_direction, pitch_angle)
+    yaw_idx, pitch_idx = np.unravel_index(np.argmax(surface), surface.shape)
+
+    # Refine the best grid point with alternating 1-D bounded searches within one grid step
+    yaw, pitch = yaw_angles[yaw_idx], pitch_angles[pitch_idx]
+    yaw_step = yaw_angles[1] - yaw_angles[0]
+    pitch_step = pitch_angles[1] - pitch_angles[0]
+    for _ in range(2):
+        yaw = _minimize_coordinate(
+            lambda value: power_model([value, pitch], ws3_rho, wind_direction, pitch_angle),
+            yaw, max(bounds[0][0], yaw - yaw_step), min(bounds[0][1], yaw + yaw_step)
+        )
+        pitch = _minimize_coordinate(
+            lambda value: power_model([yaw, value], ws3_rho, wind_direction, pitch_angle),
+            pitch, max(bounds[1][0], pitch - pitch_step), min(bounds[1][1], pitch + pitch_step)
+        )
+
     # Calculate expected power gain
-    initial_power = -power_model(initial_params, data, wind_speed_threshold)
-    optimized_power = -result.fun
+    initial_power = -power_model(initial_params, ws3_rho, wind_direction, pitch_angle)
+    optimized_power = -power_model([yaw, pitch], ws3_rho, wind_direction, pitch_angle)
     power_gain_percent = (optimized_power / initial_power - 1) * 100 if initial_power > 0 else 0
 
     return {
-        'yaw_angle': result.x[0],
-        'pitch_angle': result.x[1]
+        'yaw_angle': yaw % 360,
+        'pitch_angle': pitch
     }, power_gain_percent
+
+
+def _minimize_coordinate(objective, value, lower, upper):
+    """
+    Minimize a 1-D objective within [lower, upper], keeping value unless it improves.
+
+    Args:
+        objective: Function of a single parameter to minimize
+        value: Current parameter value
+        lower: Lower bound of the search interval
+        upper: Upper bound of the search interval
+
+    Returns:
+        Best parameter value found
+    """
+    if upper <= lower:
+        return value
+
+    result = minimize_scalar(objective, bounds=(lower, upper), method='bounded', options={'xatol': 1e-6})
+
+    return result.x if result.fun < objective(value) else value
@@ -0,0 +1,101 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from data_processor import extract_arrays, process_csv_in_chunks, process_data
+
+
+def _turbine_frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2023-01-01', periods=n, freq='min').strftime('%Y-%m-%d %H:%M:%S'),
+        'wind_speed': rng.uniform(0, 25, n).round(2),
+        'wind_direction': rng.uniform(0, 360, n).round(1),
+        'temperature': rng.normal(12, 3, n).round(1),
+        'air_density': rng.normal(1.22, 0.01, n).round(3),
+        'power_output': rng.uniform(0, 2000, n).round(1),
+        'yaw_angle': rng.uniform(0, 360, n).round(1),
+        'pitch_angle': rng.uniform(0, 5, n).round(2),
+        # Integers in the first blocks, a float in the last row
+        'rotor_rpm': rng.integers(0, 20, n)
+    })
+    data['rotor_rpm'] = data['rotor_rpm'].astype(object)
+    data.loc[n - 1, 'rotor_rpm'] = 12.5
+    return data
+
+
+def _csv_bytes(data):
+    return data.to_csv(index=False).encode()
+
+
+def _assert_same_arrays(streamed, expected):
+    assert streamed.keys() == expected.keys()
+    for column, values in expected.items():
+        np.testing.assert_allclose(streamed[column], values, rtol=1e-6, err_msg=column)
+
+
+def test_process_csv_in_chunks_matches_process_data_across_blocks():
+    data = _turbine_frame()
+    file_bytes = _csv_bytes(data)
+
+    streamed = process_csv_in_chunks(io.BytesIO(file_bytes), block_size=1 << 14)
+    expected = extract_arrays(process_data(pd.read_csv(io.BytesIO(file_bytes))))
+
+    assert len(streamed['wind_speed']) == len(data)
+    _assert_same_arrays(streamed, expected)
+
+
+def test_process_csv_in_chunks_all_rows_filtered():
+    data = _turbine_frame(500)
+    data['wind_speed'] = -1.0
+    file_bytes = _csv_bytes(data)
+
+    streamed = process_csv_in_chunks(io.BytesIO(file_bytes), block_size=1 << 12)
+    expected = extract_arrays(process_data(pd.read_csv(io.BytesIO(file_bytes))))
+
+    assert len(streamed['wind_speed']) == 0
+    _assert_same_arrays(streamed, expected)
+
+
+def test_process_csv_in_chunks_header_only():
+    file_bytes = _csv_bytes(_turbine_frame().iloc[:0])
+
+    streamed = process_csv_in_chunks(io.BytesIO(file_bytes))
+    expected = extract_arrays(process_data(pd.read_csv(io.BytesIO(file_bytes))))
+
+    assert len(streamed['wind_speed']) == 0
+    _assert_same_arrays(streamed, expected)
+
+
+def _gap_frame(n=1000):
+    return pd.DataFrame({
+        'wind_speed': np.arange(n) * 0.01,
+        'wind_direction': np.full(n, 250.0),
+        'air_density': np.full(n, 1.225),
+        'power_output': np.full(n, 1000.0),
+        'pitch_angle': np.full(n, 2.0)
+    })
+
+
+def test_process_data_fills_sparse_gaps_forward_then_backward():
+    data = _gap_frame()
+    data.loc[[0, 500], 'wind_speed'] = np.nan
+
+    processed = process_data(data)
+
+    # The leading gap is back-filled instead of being dropped by the wind speed filter
+    assert len(processed) == len(data)
+    assert np.isclose(processed['wind_speed'].iloc[0], 0.01)
+    assert np.isclose(processed['wind_speed'].iloc[500], 4.99)
+
+
+def test_process_data_interpolates_dense_gaps():
+    data = _gap_frame()
+    data.loc[::5, 'wind_speed'] = np.nan
+
+    processed = process_data(data)
+
+    assert len(processed) == len(data)
+    assert np.isclose(processed['wind_speed'].iloc[0], 0.01)
+    assert np.isclose(processed['wind_speed'].iloc[500], 5.00)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from data_processor import calculate_metrics_arrays
+from power_optimizer import optimize_power_arrays, power_model, power_surface
+
+
+def _north_straddling_arrays(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'wind_speed': rng.uniform(12, 20, n).astype(np.float32),
+        'wind_direction': (rng.normal(0, 8, n) % 360).astype(np.float32),
+        'air_density': np.full(n, 1.225, dtype=np.float32),
+        'pitch_angle': rng.uniform(1, 3, n).astype(np.float32),
+        'power_output': rng.uniform(500, 2000, n).astype(np.float32)
+    }
+
+
+def test_power_model_is_symmetric_across_north():
+    wind_direction = np.array([350, 355, 0, 5, 10], dtype=np.float64)
+    ws3_rho = np.ones_like(wind_direction)
+    pitch_angle = np.zeros_like(wind_direction)
+
+    below = power_model([-10, 0], ws3_rho, wind_direction, pitch_angle)
+    above = power_model([10, 0], ws3_rho, wind_direction, pitch_angle)
+
+    assert np.isclose(below, above)
+    assert np.isclose(below, power_model([350, 0], ws3_rho, wind_direction, pitch_angle))
+    assert np.isclose(above, power_model([370, 0], ws3_rho, wind_direction, pitch_angle))
+
+
+def test_power_model_misalignment_is_never_negative():
+    # wd=2°, yaw=370° is 8° off target
+    power = -power_model([370, 0], np.ones(1), np.array([2.]), np.zeros(1))
+
+    assert np.isclose(power, 1 - 0.01 * 8)
+
+
+def test_power_model_accepts_strided_integer_and_read_only_arrays():
+    wind_direction = np.arange(0, 20, dtype=np.float64)
+    ws3_rho = np.ones(20)
+    pitch_angle = np.zeros(20)
+    expected = power_model([5, 0], ws3_rho[::2], wind_direction[::2], pitch_angle[::2])
+
+    read_only = wind_direction[::2].copy()
+    read_only.flags.writeable = False
+
+    assert np.isclose(power_model([5, 0], ws3_rho[::2], read_only, pitch_angle[::2]), expected)
+    assert np.isclose(power_model([5, 0], ws3_rho[::2], np.arange(0, 20, 2), pitch_angle[::2]), expected)
+    assert np.isclose(power_model([5, 0], ws3_rho[::2].astype(np.float32), wind_direction[::2],
+                                  pitch_angle[::2]), expected)
+
+
+def test_power_surface_matches_power_model_outside_0_360():
+    arrays = _north_straddling_arrays(200)
+    ws3_rho = 0.25 * arrays['air_density'] * arrays['wind_speed'] ** 3
+    yaw_angles = np.array([-20., 5., 375.])
+    pitch_angles = np.array([1., 2.5])
+
+    surface = power_surface(yaw_angles, pitch_angles, ws3_rho, arrays['wind_direction'], arrays['pitch_angle'])
+
+    for i, yaw in enumerate(yaw_angles):
+        for j, pitch in enumerate(pitch_angles):
+            expected = -power_model([yaw, pitch], ws3_rho, arrays['wind_direction'], arrays['pitch_angle'])
+            assert np.isclose(surface[i, j], expected, rtol=1e-5)
+
+
+def test_optimize_power_arrays_finds_north_optimum():
+    arrays = _north_straddling_arrays()
+    rng = np.random.default_rng(1)
+    n = len(arrays['wind_direction'])
+    # Tight cluster just east of north plus a broad one to the west-north-west
+    arrays['wind_direction'] = (np.concatenate([rng.normal(5, 4, n // 2), rng.normal(330, 30, n - n // 2)])
+                                % 360).astype(np.float32)
+
+    optimized_params, expected_gain = optimize_power_arrays(arrays, yaw_angle_range=22)
+
+    # Brute-force the yaw optimum with an explicitly circular misalignment
+    ws3_rho = 0.25 * arrays['air_density'].astype(np.float64) * arrays['wind_speed'] ** 3
+    candidates = np.arange(-40, 40, 0.25)
+    misalignment = np.mod(arrays['wind_direction'][None, :] - candidates[:, None], 360)
+    misalignment = np.minimum(misalignment, 360 - misalignment)
+    best_yaw = candidates[np.argmax((ws3_rho * (1 - 0.01 * misalignment)).mean(axis=1))]
+
+    yaw = optimized_params['yaw_angle']
+    distance = abs(yaw - best_yaw) % 360
+    assert 0 <= yaw < 360
+    assert min(distance, 360 - distance) < 1
+    assert expected_gain >= 0
+
+
+def test_calculate_metrics_wraps_yaw_across_north():
+    arrays = _north_straddling_arrays()
+
+    _, near = calculate_metrics_arrays(arrays, {'yaw_angle': 1.0, 'pitch_angle': 2.0})
+    _, wrapped = calculate_metrics_arrays(arrays, {'yaw_angle': 361.0, 'pitch_angle': 2.0})
+
+    assert np.isclose(near['avg_power'], wrapped['avg_power'])